@@ -46,6 +46,13 @@ const LLM_MODEL = process.env.LLM_MODEL || 'claude-3-haiku-20240307';
 
 const anthropic = new Anthropic({ apiKey: ANTHROPIC_API_KEY });
 
+// Phrases that mark a glasses query as being about uploaded documents
+const DOCUMENT_QUERY_KEYWORDS = [
+  'document', 'file', 'upload', 'pdf', 'guide', 'summarize', 
+  'summary', 'what does', 'what is', 'tell me about', 'explain',
+  'nutrition', 'manley', 'performance'
+];
+
 // ============================================================================
 // Multer Configuration for File Uploads
 // ============================================================================
@@ -224,11 +231,6 @@ interface SessionState {
   dbSessionId?: number;
   autoAdvancePages: boolean;
   pageDisplayDuration: number;
-  eventHistory: Array<{
-    type: string;
-    data: any;
-    timestamp: string;
-  }>;
 }
 
 interface QueuedEvent {
@@ -238,11 +240,81 @@ interface QueuedEvent {
   sessionId?: string;
 }
 
+// Queue entry: the event, its absolute sequence number and its JSON,
+// serialized once when it is added
+interface StoredEvent {
+  event: QueuedEvent;
+  seq: number;
+  json: string;
+}
+
 interface JWTPayload {
   userId: number;
   email: string;
 }
 
+// ============================================================================
+// Coarse Timestamps
+// ============================================================================
+// Event and status timestamps only need ~100ms resolution, so the ISO string is
+// reformatted at most once per window instead of allocating a Date and a new
+// string on every call.
+const TIMESTAMP_RESOLUTION_MS = 100;
+let cachedTimestampMs = 0;
+let cachedTimestamp = '';
+
+function coarseTimestamp(): string {
+  const now = Date.now();
+  if (now - cachedTimestampMs >= TIMESTAMP_RESOLUTION_MS) {
+    cachedTimestampMs = now;
+    cachedTimestamp = new Date(now).toISOString();
+  }
+  return cachedTimestamp;
+}
+
+// ============================================================================
+// Event Ring Buffer
+// ============================================================================
+// Fixed-capacity FIFO for the event queue. Once full, each push overwrites the
+// oldest slot in O(1) instead of Array.shift() reindexing every entry, and
+// slice() copies only the requested window.
+class EventRing<T> {
+  private items: T[] = [];
+  private head = 0;
+
+  constructor(private readonly capacity: number) {}
+
+  get length(): number {
+    return this.items.length;
+  }
+
+  // The entry the next push() will overwrite, or undefined while slots remain
+  peekEvictable(): T | undefined {
+    return this.items.length < this.capacity ? undefined : this.items[this.head];
+  }
+
+  push(item: T): void {
+    if (this.items.length < this.capacity) {
+      this.items.push(item);
+      return;
+    }
+    this.items[this.head] = item;
+    this.head = (this.head + 1) % this.capacity;
+  }
+
+  slice(start: number, end: number): T[] {
+    const size = this.items.length;
+    start = Math.max(0, Math.min(start, size));
+    end = Math.max(start, Math.min(end, size));
+
+    const window: T[] = new Array(end - start);
+    for (let i = start; i < end; i++) {
+      window[i - start] = this.items[(this.head + i) % this.capacity];
+    }
+    return window;
+  }
+}
+
 // ============================================================================
 // Authentication Middleware
 // ============================================================================
@@ -268,8 +340,20 @@ function authenticateToken(req: any, res: Response, next: any) {
 // ============================================================================
 class PhoneGPTMentraOSApp extends AppServer {
   private sessions: Map<string, SessionState> = new Map();
-  private eventQueue: QueuedEvent[] = [];
   private readonly MAX_QUEUE_SIZE = 1000;
+  private readonly MAX_CONVERSATION_HISTORY = 64;
+  private eventQueue = new EventRing<StoredEvent>(this.MAX_QUEUE_SIZE);
+  private eventTypeCounts: Map<string, number> = new Map();
+  private pendingEvents: Array<[string, any, string | undefined]> = [];
+  private flushScheduled = false;
+  // Sequence number of the next event; never reset, so `since` / `last_index`
+  // stay valid after the ring buffer starts evicting
+  private nextEventSeq = 0;
+  private eventWaiters: Set<() => void> = new Set();
+  private readonly MAX_LONG_POLL_SECONDS = 60;
+  private eventStreams: Set<Response> = new Set();
+  private readonly STREAM_HEARTBEAT_MS = 15000;
+  private readonly MAX_STREAM_BUFFER_BYTES = 1024 * 1024;
 
   constructor() {
     super({
@@ -304,6 +388,13 @@ class PhoneGPTMentraOSApp extends AppServer {
       next();
     });
 
+    // Deliberately app-wide: Express only has an application-level etag
+    // setting. /api responses are never revalidated (see above), so their
+    // ETags were pure hashing overhead. The SDK's own routes (webhook, /tool,
+    // /settings, /health) are uncached JSON as well, and its static webview
+    // files are served by express.static, which sets ETags independently.
+    app.set('etag', false);
+
     // CORS Configuration
     app.use(cors({
       origin: function(origin: any, callback: any) {
@@ -317,15 +408,30 @@ class PhoneGPTMentraOSApp extends AppServer {
     // JSON parsing
     app.use(express.json());
 
-    // Request logging
+    // Request logging goes through the SDK's pino logger, which writes from a
+    // transport worker thread. Polling and streaming endpoints are skipped,
+    // they would otherwise dominate the log.
+    const logger = this.logger;
+    const quietPaths = new Set([
+      '/api/health',
+      '/api/stats',
+      '/api/events',
+      '/api/events/long',
+      '/api/events/stream',
+    ]);
+
     app.use((req: Request, res: Response, next: any) => {
+      if (quietPaths.has(req.path)) {
+        return next();
+      }
+
       const start = Date.now();
       const originalEnd = res.end;
 
       res.end = function(...args: any[]) {
         const duration = Date.now() - start;
         const statusColor = res.statusCode >= 400 ? '❌' : '✅';
-        console.log(`${statusColor} ${req.method} ${req.path} - ${res.statusCode} (${duration}ms)`);
+        logger.info(`${statusColor} ${req.method} ${req.path} - ${res.statusCode} (${duration}ms)`);
         return originalEnd.apply(res, args);
       };
 
@@ -666,13 +772,14 @@ class PhoneGPTMentraOSApp extends AppServer {
           return res.status(404).json({ error: 'Session not found' });
         }
         
+        // Active glass session, if connected
+        const glassState = this.sessions.get(sessionId.toString());
+        
         // Update page display settings
         if (pageDisplayDuration !== undefined) {
           db.prepare('UPDATE glassSessions SET page_display_duration = ? WHERE id = ?')
             .run(pageDisplayDuration, sessionId);
           
-          // Update active glass session if connected
-          const glassState = this.sessions.get(sessionId.toString());
           if (glassState) {
             glassState.pageDisplayDuration = pageDisplayDuration;
           }
@@ -682,7 +789,6 @@ class PhoneGPTMentraOSApp extends AppServer {
           db.prepare('UPDATE glassSessions SET auto_advance_pages = ? WHERE id = ?')
             .run(autoAdvance ? 1 : 0, sessionId);
           
-          const glassState = this.sessions.get(sessionId.toString());
           if (glassState) {
             glassState.autoAdvancePages = autoAdvance;
           }
@@ -1323,35 +1429,93 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
     app.get('/api/health', (req: Request, res: Response) => {
       res.json({ 
         status: 'healthy',
-        timestamp: new Date().toISOString(),
+        timestamp: coarseTimestamp(),
         glassSessionsActive: this.sessions.size,
         databaseConnected: true
       });
     });
 
     app.get('/api/events', (req: Request, res: Response) => {
-      const since = parseInt(req.query.since as string) || 0;
+      const since = Math.max(0, parseInt(req.query.since as string) || 0);
       const limit = parseInt(req.query.limit as string) || 100;
-      const newEvents = this.eventQueue.slice(since, since + limit);
 
-      res.json({
-        events: newEvents,
-        count: this.eventQueue.length,
-        last_index: Math.min(since + newEvents.length, this.eventQueue.length),
-      });
+      res.type('json').send(this.serializeEventWindow(since, limit));
     });
 
-    app.get('/api/stats', (req: Request, res: Response) => {
-      const eventTypes: Record<string, number> = {};
-      for (const event of this.eventQueue) {
-        eventTypes[event.type] = (eventTypes[event.type] || 0) + 1;
+    // Long-poll variant: answers immediately if events past `since` exist,
+    // otherwise holds the request until new events are flushed or `timeout` elapses.
+    app.get('/api/events/long', (req: Request, res: Response) => {
+      const since = Math.max(0, parseInt(req.query.since as string) || 0);
+      const limit = parseInt(req.query.limit as string) || 100;
+      const timeoutSeconds = Math.min(
+        Math.max(parseInt(req.query.timeout as string) || 30, 1),
+        this.MAX_LONG_POLL_SECONDS
+      );
+
+      if (since < this.nextEventSeq) {
+        return res.type('json').send(this.serializeEventWindow(since, limit));
       }
 
+      // A client ahead of the counter (e.g. after a server restart) waits for
+      // the next event rather than for a sequence number that may never come
+      const waitFrom = this.nextEventSeq;
+
+      const cleanup = () => {
+        clearTimeout(timer);
+        this.eventWaiters.delete(onEvent);
+      };
+
+      const onEvent = () => {
+        cleanup();
+        res.type('json').send(this.serializeEventWindow(waitFrom, limit));
+      };
+
+      const timer = setTimeout(() => {
+        cleanup();
+        res.type('json').send(this.serializeEventWindow(waitFrom, limit));
+      }, timeoutSeconds * 1000);
+
+      this.eventWaiters.add(onEvent);
+      res.on('close', cleanup);
+    });
+
+    // Server-Sent Events: one long-lived response per client, written to as
+    // each batch of events is flushed.
+    app.get('/api/events/stream', (req: Request, res: Response) => {
+      res.set({
+        'Content-Type': 'text/event-stream',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no',
+      });
+      res.flushHeaders();
+      res.write(': connected\n\n');
+
+      // Reconnecting EventSource clients send the id of the last frame they
+      // saw; replay whatever is still queued after it
+      const lastEventId = parseInt(req.get('Last-Event-ID') || '');
+      if (!isNaN(lastEventId)) {
+        const missed = this.getEventsSince(lastEventId + 1, this.MAX_QUEUE_SIZE);
+        if (missed.length > 0) {
+          res.write(missed.map((stored) => this.toStreamFrame(stored)).join(''));
+        }
+      }
+
+      // Comment frames keep idle proxies from closing the connection
+      const heartbeat = setInterval(() => res.write(': ping\n\n'), this.STREAM_HEARTBEAT_MS);
+
+      this.eventStreams.add(res);
+      res.on('close', () => {
+        clearInterval(heartbeat);
+        this.eventStreams.delete(res);
+      });
+    });
+
+    app.get('/api/stats', (req: Request, res: Response) => {
       res.json({
         total_events: this.eventQueue.length,
-        event_types: eventTypes,
+        event_types: Object.fromEntries(this.eventTypeCounts),
         active_glass_sessions: this.sessions.size,
-        timestamp: new Date().toISOString(),
+        timestamp: coarseTimestamp(),
       });
     });
 
@@ -1363,12 +1527,7 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
   // ============================================================================
 
   protected async onSession(session: AppSession, sessionId: string, userId: string): Promise<void> {
-    console.log('\n' + '='.repeat(60));
-    console.log('🔵 NEW GLASS SESSION STARTED');
-    console.log(`   Session ID: ${sessionId}`);
-    console.log(`   User ID: ${userId}`);
-    console.log(`   Timestamp: ${new Date().toISOString()}`);
-    console.log('='.repeat(60) + '\n');
+    this.logger.info(`🔵 Glass session started: ${sessionId} (user ${userId})`);
 
     // Try to find existing user by device ID mapping
     let dbUserId = 1; // Default to user 1 for now
@@ -1393,7 +1552,7 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
       db.prepare('UPDATE glassSessions SET is_active = 1 WHERE id = ?').run(dbSession.id);
     }
 
-    console.log(`📁 Session persona: ${dbSession.persona}`);
+    this.logger.info(`📁 Session persona: ${dbSession.persona}`);
 
     const sessionState: SessionState = {
       sessionId,
@@ -1410,7 +1569,6 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
       dbSessionId: dbSession.id,
       autoAdvancePages: true,
       pageDisplayDuration: dbSession.page_display_duration || 5000,
-      eventHistory: [],
     };
 
     this.sessions.set(sessionId, sessionState);
@@ -1424,13 +1582,13 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
     // Setup transcription listener with PROPER PAGINATION
     session.events.onTranscription(async (data) => {
       if (sessionState.isPaused) {
-        console.log('🔇 Microphone paused - ignoring voice input');
+        this.logger.debug('🔇 Microphone paused - ignoring voice input');
         return;
       }
 
       if (data.isFinal) {
         const transcript = data.text.trim();
-        console.log(`🎤 Voice: "${transcript}"`);
+        this.logger.debug(`🎤 Voice: "${transcript}"`);
         
         this.addEvent('voice_input', { transcript, sessionId }, sessionId);
         sessionState.state = 'processing';
@@ -1458,7 +1616,11 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
           currentPage: 0
         };
 
+        // Only the latest entry is paged through; full history lives in glassConversations
         sessionState.conversation.push(conversationEntry);
+        if (sessionState.conversation.length > this.MAX_CONVERSATION_HISTORY) {
+          sessionState.conversation.shift();
+        }
         sessionState.lastResponse = aiResponse;
         sessionState.currentPageIndex = 0;
         sessionState.state = 'displaying';
@@ -1473,11 +1635,11 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
           .run(sessionState.dbSessionId);
 
         // ===== PAGINATION AUTO-ADVANCE LOGIC =====
-        console.log(`📄 Response has ${pages.length} page(s)`);
+        this.logger.debug(`📄 Response has ${pages.length} page(s)`);
         
         if (pages.length > 1) {
           // Multiple pages - auto-advance through them
-          console.log(`⏱️ Auto-advancing through ${pages.length} pages at ${sessionState.pageDisplayDuration}ms per page`);
+          this.logger.debug(`⏱️ Auto-advancing through ${pages.length} pages at ${sessionState.pageDisplayDuration}ms per page`);
           
           // Display first page
           this.displayPage(session, pages[0], sessionState.pageDisplayDuration, pages.length, 0);
@@ -1488,7 +1650,7 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
               // Check if still in displaying state and not paused
               if (sessionState.state === 'displaying' && !sessionState.isPaused) {
                 sessionState.currentPageIndex = i;
-                console.log(`📄 Displaying page ${i + 1}/${pages.length}`);
+                this.logger.debug(`📄 Displaying page ${i + 1}/${pages.length}`);
                 this.displayPage(session, pages[i], sessionState.pageDisplayDuration, pages.length, i);
                 
                 // After last page, return to listening state
@@ -1496,7 +1658,7 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
                   setTimeout(() => {
                     if (!sessionState.isPaused) {
                       sessionState.state = 'listening';
-                      console.log('✅ Returned to listening state');
+                      this.logger.debug('✅ Returned to listening state');
                     }
                   }, sessionState.pageDisplayDuration);
                 }
@@ -1505,14 +1667,14 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
           }
         } else {
           // Single page response
-          console.log('📄 Single page response');
+          this.logger.debug('📄 Single page response');
           this.displayPage(session, pages[0], sessionState.pageDisplayDuration, 1, 0);
           
           // Return to listening after display duration
           setTimeout(() => {
             if (!sessionState.isPaused) {
               sessionState.state = 'listening';
-              console.log('✅ Returned to listening state');
+              this.logger.debug('✅ Returned to listening state');
             }
           }, sessionState.pageDisplayDuration);
         }
@@ -1527,7 +1689,7 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
     });
 
     session.events.onDisconnected(() => {
-      console.log(`🔴 Glass session ended: ${sessionId}`);
+      this.logger.info(`🔴 Glass session ended: ${sessionId}`);
       this.addEvent('glass_disconnected', { sessionId }, sessionId);
       
       if (sessionState.dbSessionId) {
@@ -1540,47 +1702,49 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
 
   private async generateAIResponseWithDocuments(transcript: string, persona: string, userId: number): Promise<string> {
     try {
-      console.log(`🤖 Generating AI response for persona: ${persona}, userId: ${userId}`);
+      this.logger.debug(`🤖 Generating AI response for persona: ${persona}, userId: ${userId}`);
       
       // Get ALL documents for this persona
       const documents = db.prepare(
         'SELECT fileName, content FROM documents WHERE userId = ? AND persona = ? ORDER BY created_at DESC'
       ).all(userId, persona);
       
-      console.log(`📚 Found ${documents.length} documents in ${persona} persona`);
+      this.logger.debug(`📚 Found ${documents.length} documents in ${persona} persona`);
       
       // Build comprehensive document context
-      let documentContext = '';
+      // Prompt sections are collected as parts and joined once below
+      const contextParts: string[] = [];
       const documentList: string[] = [];
       
       if (documents.length > 0) {
-        documentContext = `\n=== UPLOADED DOCUMENTS IN ${persona.toUpperCase()} CONTEXT ===\n\n`;
+        contextParts.push(`\n=== UPLOADED DOCUMENTS IN ${persona.toUpperCase()} CONTEXT ===\n\n`);
         
         documents.forEach((doc: any, index: number) => {
           documentList.push(doc.fileName);
-          documentContext += `📄 Document ${index + 1}: "${doc.fileName}"\n`;
-          documentContext += `Content:\n${doc.content}\n\n`;
-          documentContext += '---\n\n';
+          contextParts.push(
+            `📄 Document ${index + 1}: "${doc.fileName}"\n`,
+            `Content:\n${doc.content}\n\n`,
+            '---\n\n'
+          );
         });
         
-        documentContext += `\n=== END OF DOCUMENTS ===\n\n`;
-        documentContext += `IMPORTANT INSTRUCTIONS:\n`;
-        documentContext += `1. You have access to ${documents.length} document(s) listed above.\n`;
-        documentContext += `2. When the user asks about documents, uploaded files, or references content, USE the document content above to answer.\n`;
-        documentContext += `3. If asked to summarize, provide a comprehensive summary of the relevant document.\n`;
-        documentContext += `4. Always mention which document you're referencing by name.\n`;
-        documentContext += `5. Be specific and quote relevant sections when appropriate.\n\n`;
+        contextParts.push(
+          `\n=== END OF DOCUMENTS ===\n\n`,
+          `IMPORTANT INSTRUCTIONS:\n`,
+          `1. You have access to ${documents.length} document(s) listed above.\n`,
+          `2. When the user asks about documents, uploaded files, or references content, USE the document content above to answer.\n`,
+          `3. If asked to summarize, provide a comprehensive summary of the relevant document.\n`,
+          `4. Always mention which document you're referencing by name.\n`,
+          `5. Be specific and quote relevant sections when appropriate.\n\n`
+        );
       }
       
-      // Check if query is document-related
-      const documentKeywords = [
-        'document', 'file', 'upload', 'pdf', 'guide', 'summarize', 
-        'summary', 'what does', 'what is', 'tell me about', 'explain',
-        'nutrition', 'manley', 'performance'
-      ];
+      const documentContext = contextParts.join('');
       
-      const isDocumentQuery = documentKeywords.some(keyword => 
-        transcript.toLowerCase().includes(keyword)
+      // Check if query is document-related
+      const normalizedTranscript = transcript.toLowerCase();
+      const isDocumentQuery = DOCUMENT_QUERY_KEYWORDS.some(keyword => 
+        normalizedTranscript.includes(keyword)
       );
       
       // Build the prompt
@@ -1607,7 +1771,7 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
       // Combine everything
       const fullPrompt = systemPrompt + documentContext + `\nUser Query: "${transcript}"\n\nResponse:`;
       
-      console.log(`📝 Prompt includes ${documents.length} documents, total length: ${fullPrompt.length} chars`);
+      this.logger.debug(`📝 Prompt includes ${documents.length} documents, total length: ${fullPrompt.length} chars`);
       
       const message = await anthropic.messages.create({
         model: LLM_MODEL,
@@ -1619,7 +1783,7 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
       });
 
       const response = message.content[0].type === 'text' ? message.content[0].text : 'Unable to process';
-      console.log(`✅ AI Response generated: ${response.substring(0, 100)}...`);
+      this.logger.debug(`✅ AI Response generated: ${response.substring(0, 100)}...`);
       
       return response;
     } catch (error) {
@@ -1660,20 +1824,114 @@ app.post('/api/documents', authenticateToken, upload.single('file'), async (req:
     });
   }
 
+  // Queued events with sequence number >= `since`, oldest first. Events that
+  // have already been evicted are skipped.
+  private getEventsSince(since: number, limit: number): StoredEvent[] {
+    const firstSeq = this.nextEventSeq - this.eventQueue.length;
+    const offset = Math.max(since, firstSeq) - firstSeq;
+    return this.eventQueue.slice(offset, offset + limit);
+  }
+
+  // Splices the cached per-event JSON into the response body rather than
+  // re-serializing every event on each poll. `since` and `last_index` are
+  // absolute sequence numbers, so a client passing back `last_index` never
+  // skips or repeats events as the ring buffer evicts.
+  private serializeEventWindow(since: number, limit: number): string {
+    const window = this.getEventsSince(since, limit);
+    const count = this.eventQueue.length;
+    const lastIndex = window.length > 0
+      ? window[window.length - 1].seq + 1
+      : Math.min(since, this.nextEventSeq);
+    const events = window.map((stored) => stored.json).join(',');
+
+    return `{"events":[${events}],"count":${count},"last_index":${lastIndex}}`;
+  }
+
+  private toStreamFrame(stored: StoredEvent): string {
+    return `id: ${stored.seq}\ndata: ${stored.json}\n\n`;
+  }
+
   private addEvent(eventType: string, data: any, sessionId?: string) {
-    const event: QueuedEvent = {
-      type: eventType,
-      data,
-      timestamp: new Date().toISOString(),
-      sessionId,
-    };
+    this.pendingEvents.push([eventType, data, sessionId]);
 
-    this.eventQueue.push(event);
-    if (this.eventQueue.length > this.MAX_QUEUE_SIZE) {
-      this.eventQueue.shift();
+    if (!this.flushScheduled) {
+      this.flushScheduled = true;
+      setImmediate(() => this.flushEvents());
     }
+  }
 
-    console.log(`📨 Event: ${eventType}`);
+  // Drains everything added since the last flush in one pass: a single
+  // timestamp for the batch, one wake-up for long-pollers and one write per
+  // SSE stream, however many events a burst produced.
+  private flushEvents() {
+    const batch = this.pendingEvents;
+    this.pendingEvents = [];
+    this.flushScheduled = false;
+
+    const timestamp = coarseTimestamp();
+    const frames: string[] = [];
+
+    for (const [eventType, data, sessionId] of batch) {
+      // Keep the per-type histogram in step with the queue, including the
+      // entry that falls off the front once it is full
+      const evicted = this.eventQueue.peekEvictable();
+      if (evicted) {
+        const evictedType = evicted.event.type;
+        const remaining = this.eventTypeCounts.get(evictedType)! - 1;
+        if (remaining > 0) {
+          this.eventTypeCounts.set(evictedType, remaining);
+        } else {
+          this.eventTypeCounts.delete(evictedType);
+        }
+      }
+      this.eventTypeCounts.set(eventType, (this.eventTypeCounts.get(eventType) || 0) + 1);
+
+      // Recycle the evicted entry instead of allocating a new object per event.
+      // Entries are mutated in place here, so callers of getEventsSince() must
+      // finish with the returned entries before yielding the event loop.
+      const stored: StoredEvent = evicted ?? {
+        event: {
+          type: '',
+          data: null,
+          timestamp: '',
+          sessionId: undefined,
+        },
+        seq: 0,
+        json: '',
+      };
+      const event = stored.event;
+      event.type = eventType;
+      event.data = data;
+      event.timestamp = timestamp;
+      event.sessionId = sessionId;
+      stored.seq = this.nextEventSeq++;
+      stored.json = JSON.stringify(event);
+
+      this.eventQueue.push(stored);
+
+      if (this.eventStreams.size > 0) {
+        frames.push(this.toStreamFrame(stored));
+      }
+    }
+
+    for (const wake of [...this.eventWaiters]) {
+      wake();
+    }
+
+    if (frames.length > 0) {
+      const chunk = frames.join('');
+      for (const stream of this.eventStreams) {
+        // A client that stopped reading would otherwise buffer every flush in
+        // memory for as long as it holds the connection. Drop it instead; it
+        // can reconnect and resume from Last-Event-ID.
+        if (stream.writableLength > this.MAX_STREAM_BUFFER_BYTES) {
+          this.eventStreams.delete(stream);
+          stream.destroy();
+          continue;
+        }
+        stream.write(chunk);
+      }
+    }
   }
 
   public async start() {